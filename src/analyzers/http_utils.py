@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import random
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Per-host concurrency cap and retry/backoff tuning shared by the analyzers
+MAX_CONCURRENCY_PER_HOST = 8
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+
+# Status codes that signal the host wants slower probing
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+async def request_with_retry(session: aiohttp.ClientSession, method: str, url: str,
+                             semaphores: dict = None,
+                             attempts: int = RETRY_ATTEMPTS, **kwargs) -> aiohttp.ClientResponse:
+    """Issue a request with per-host concurrency limiting and backoff
+
+    Retries 429/5xx responses with exponential backoff plus jitter,
+    honouring a numeric Retry-After header when the server sends one.
+    The caller owns the returned response and must release it.
+    """
+    semaphore = None
+    if semaphores is not None:
+        host = urlparse(url).netloc
+        semaphore = semaphores.get(host)
+        if semaphore is None:
+            semaphore = semaphores[host] = asyncio.Semaphore(MAX_CONCURRENCY_PER_HOST)
+
+    response = None
+    for attempt in range(attempts):
+        if semaphore is not None:
+            async with semaphore:
+                response = await session.request(method, url, **kwargs)
+        else:
+            response = await session.request(method, url, **kwargs)
+
+        if response.status not in RETRYABLE_STATUSES or attempt == attempts - 1:
+            return response
+
+        retry_after = response.headers.get('Retry-After')
+        response.release()
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, 0.1)
+
+        logger.debug("Got %s from %s; retrying in %.2fs", response.status, url, delay)
+        await asyncio.sleep(delay)
+
+    return response
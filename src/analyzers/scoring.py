@@ -1,14 +1,165 @@
-from typing import Dict, List, TypedDict, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, TypedDict, Optional
+from dataclasses import dataclass, replace
+from functools import lru_cache
 
-@dataclass
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; batch scoring falls back to NumPy
+    njit = None
+
+try:
+    from analyzers import scoring_core  # compiled from scoring_core.pyx, optional
+except ImportError:
+    scoring_core = None
+
+@dataclass(slots=True)
 class ScoreComponent:
     score: float
     max_score: float
     details: Dict[str, any]
     recommendations: List[str]
 
+@dataclass(slots=True)
+class TrustScoreResult:
+    """Aggregate scoring result: attribute access instead of dict lookups"""
+    total_score: float
+    trust_level: str
+    components: Dict[str, ScoreComponent]
+    recommendations: List[str]
+    review_diversity_details: Optional[Dict] = None
+
+    def to_dict(self) -> Dict:
+        """Flatten back to the legacy dict shape for JSON serialization"""
+        result = {
+            'total_score': self.total_score,
+            'trust_level': self.trust_level,
+            'components': self.components,
+            'recommendations': self.recommendations
+        }
+        if self.review_diversity_details is not None:
+            result['review_diversity_details'] = self.review_diversity_details
+        return result
+
+# Shared strings for the technical calculator, allocated once at import
+# so batch scoring reuses the same objects instead of rebuilding them
+_SSL_OK = 'Valid SSL certificate'
+_SSL_BAD = 'Missing or invalid SSL certificate'
+_SSL_REC = 'Implement HTTPS with a valid SSL certificate'
+_HEADERS_REC = 'Implement missing security headers'
+_HEADER_DETAILS = tuple(f'Implemented {n}/4 security headers' for n in range(5))
+
+# Boolean-flag scoring rules, precomputed once at import time:
+# (flag, detail_key, points, ok_msg, bad_msg, recommendation)
+_REVIEW_RULES = (
+    ('has_reviews', 'review_presence', 5,
+     'Has user reviews', 'No user reviews found',
+     'Implement a review system'),
+    ('recent_reviews', 'freshness', 5,
+     'Has recent reviews', 'No recent reviews',
+     'Encourage recent reviews'),
+    ('diverse_reviews', 'diversity', 5,
+     'Has diverse reviews', 'Limited review diversity',
+     'Encourage reviews from diverse sources'),
+)
+
+_BUSINESS_RULES = (
+    ('has_credentials', 'credentials', 5,
+     'Business credentials verified', 'Missing business credentials',
+     'Add business verification credentials'),
+    ('contact_verified', 'contact', 5,
+     'Contact information verified', 'Contact information not verified',
+     'Add verified contact information'),
+)
+
+_CONTENT_RULES = (
+    ('has_resources', 'resources', 5,
+     'Quality resources present', 'Missing or low-quality resources',
+     'Add high-quality resources and documentation'),
+    ('recent_content', 'freshness', 5,
+     'Content is up to date', 'Content needs updating',
+     'Update content regularly'),
+    ('expert_content', 'expertise', 5,
+     'Expert content present', 'Missing expert content',
+     'Add expert-level content'),
+)
+
+_TRANSPARENCY_RULES = (
+    ('has_privacy_policy', 'privacy', 5,
+     'Clear privacy policy', 'Missing privacy policy',
+     'Add clear privacy policy'),
+    ('has_terms', 'terms', 5,
+     'Clear terms and conditions', 'Missing terms and conditions',
+     'Add clear terms and conditions'),
+    ('clear_pricing', 'pricing', 5,
+     'Clear pricing information', 'Unclear pricing information',
+     'Add clear pricing information'),
+)
+
+def _apply_rules(data: Dict, rules: tuple, max_score: float) -> ScoreComponent:
+    """Score a set of boolean flags against a rule table"""
+    score = 0
+    details = {}
+    recommendations = []
+
+    for flag, detail_key, points, ok_msg, bad_msg, rec in rules:
+        if data.get(flag, False):
+            score += points
+            details[detail_key] = ok_msg
+        else:
+            details[detail_key] = bad_msg
+            recommendations.append(rec)
+
+    return ScoreComponent(
+        score=score,
+        max_score=max_score,
+        details=details,
+        recommendations=recommendations
+    )
+
+# Flat flag layout for the batch scorer: the SSL check, the four
+# security headers, then every rule-table flag, in a fixed column order
+_BATCH_FLAGS = (
+    ('ssl_valid', 5),
+    ('has_hsts', 1),
+    ('has_xframe', 1),
+    ('has_content_security', 1),
+    ('has_xss_protection', 1),
+) + tuple(
+    (rule[0], rule[2])
+    for table in (_REVIEW_RULES, _BUSINESS_RULES, _CONTENT_RULES, _TRANSPARENCY_RULES)
+    for rule in table
+)
+_BATCH_FLAG_ORDER = tuple(flag for flag, _ in _BATCH_FLAGS)
+_BATCH_POINTS = np.array([points for _, points in _BATCH_FLAGS], dtype=np.int8)
+_DOMAIN_BONUS = 5  # mirrors the placeholder in calculate_technical_score
+_MAX_TOTAL = 70.0
+
+# Thresholds/labels shared with _categorize_trust_level, in ascending order
+_LEVEL_THRESHOLDS = np.array([60, 70, 80, 90])
+_LEVEL_LABELS = np.array([
+    'Needs Improvement', 'Moderate Trust', 'Good Trust',
+    'High Trust', 'Exceptional Trust'
+])
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _score_kernel(flags_u8, points, bonus, max_total):
+        """JIT-compiled per-site scoring loop for large batches"""
+        n = flags_u8.shape[0]
+        scores = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            total = bonus
+            for j in range(flags_u8.shape[1]):
+                total += flags_u8[i, j] * points[j]
+            scores[i] = total / max_total * 100.0
+        return scores
+
 class TrustScore:
+    # Sum of the five component max_scores (15+15+10+15+15)
+    _MAX_POSSIBLE = 70.0
+
     def __init__(self):
         self.score_weights = {
             'technical_security': 15,
@@ -29,10 +180,10 @@ class TrustScore:
         # SSL/HTTPS (5 points)
         if security_data.get('ssl_certificate', {}).get('status') == 'valid':
             score += 5
-            details['ssl'] = 'Valid SSL certificate'
+            details['ssl'] = _SSL_OK
         else:
-            recommendations.append('Implement HTTPS with a valid SSL certificate')
-            details['ssl'] = 'Missing or invalid SSL certificate'
+            recommendations.append(_SSL_REC)
+            details['ssl'] = _SSL_BAD
             
         # Security Headers (5 points)
         headers = security_data.get('security_headers', {})
@@ -43,10 +194,10 @@ class TrustScore:
         if headers.get('has_xss_protection'): header_score += 1
         
         score += header_score
-        details['security_headers'] = f'Implemented {header_score}/4 security headers'
-        
+        details['security_headers'] = _HEADER_DETAILS[header_score]
+
         if header_score < 4:
-            recommendations.append('Implement missing security headers')
+            recommendations.append(_HEADERS_REC)
             
         # Domain factors (5 points) - placeholder for now
         score += 5
@@ -60,181 +211,140 @@ class TrustScore:
         
     def calculate_review_score(self, review_data: Dict) -> ScoreComponent:
         """Calculate review and ratings score"""
-        score = 0
-        details = {}
-        recommendations = []
-        
-        # Review presence (5 points)
-        has_reviews = review_data.get('has_reviews', False)
-        if has_reviews:
-            score += 5
-            details['review_presence'] = 'Has user reviews'
-        else:
-            recommendations.append('Implement a review system')
-            details['review_presence'] = 'No user reviews found'
-            
-        # Review freshness (5 points)
-        if review_data.get('recent_reviews', False):
-            score += 5
-            details['freshness'] = 'Has recent reviews'
-        else:
-            recommendations.append('Encourage recent reviews')
-            details['freshness'] = 'No recent reviews'
-            
-        # Review diversity (5 points)
-        if review_data.get('diverse_reviews', False):
-            score += 5
-            details['diversity'] = 'Has diverse reviews'
-        else:
-            recommendations.append('Encourage reviews from diverse sources')
-            details['diversity'] = 'Limited review diversity'
-            
-        return ScoreComponent(
-            score=score,
-            max_score=15,
-            details=details,
-            recommendations=recommendations
-        )
-        
+        return _apply_rules(review_data, _REVIEW_RULES, 15)
+
     def calculate_business_verification_score(self, business_data: Dict) -> ScoreComponent:
         """Calculate business verification score"""
-        score = 0
-        details = {}
-        recommendations = []
-        
-        # Business credentials (5 points)
-        if business_data.get('has_credentials', False):
-            score += 5
-            details['credentials'] = 'Business credentials verified'
-        else:
-            recommendations.append('Add business verification credentials')
-            details['credentials'] = 'Missing business credentials'
-            
-        # Contact verification (5 points)
-        if business_data.get('contact_verified', False):
-            score += 5
-            details['contact'] = 'Contact information verified'
-        else:
-            recommendations.append('Add verified contact information')
-            details['contact'] = 'Contact information not verified'
-            
-        return ScoreComponent(
-            score=score,
-            max_score=10,
-            details=details,
-            recommendations=recommendations
-        )
-        
+        return _apply_rules(business_data, _BUSINESS_RULES, 10)
+
     def calculate_content_score(self, content_data: Dict) -> ScoreComponent:
         """Calculate content quality score"""
-        score = 0
-        details = {}
-        recommendations = []
-        
-        # Resource quality (5 points)
-        if content_data.get('has_resources', False):
-            score += 5
-            details['resources'] = 'Quality resources present'
-        else:
-            recommendations.append('Add high-quality resources and documentation')
-            details['resources'] = 'Missing or low-quality resources'
-            
-        # Content freshness (5 points)
-        if content_data.get('recent_content', False):
-            score += 5
-            details['freshness'] = 'Content is up to date'
-        else:
-            recommendations.append('Update content regularly')
-            details['freshness'] = 'Content needs updating'
-            
-        # Expert content (5 points)
-        if content_data.get('expert_content', False):
-            score += 5
-            details['expertise'] = 'Expert content present'
-        else:
-            recommendations.append('Add expert-level content')
-            details['expertise'] = 'Missing expert content'
-            
-        return ScoreComponent(
-            score=score,
-            max_score=15,
-            details=details,
-            recommendations=recommendations
-        )
-        
+        return _apply_rules(content_data, _CONTENT_RULES, 15)
+
     def calculate_transparency_score(self, transparency_data: Dict) -> ScoreComponent:
         """Calculate transparency score"""
-        score = 0
-        details = {}
-        recommendations = []
-        
-        # Privacy policy (5 points)
-        if transparency_data.get('has_privacy_policy', False):
-            score += 5
-            details['privacy'] = 'Clear privacy policy'
-        else:
-            recommendations.append('Add clear privacy policy')
-            details['privacy'] = 'Missing privacy policy'
-            
-        # Terms & conditions (5 points)
-        if transparency_data.get('has_terms', False):
-            score += 5
-            details['terms'] = 'Clear terms and conditions'
-        else:
-            recommendations.append('Add clear terms and conditions')
-            details['terms'] = 'Missing terms and conditions'
-            
-        # Pricing transparency (5 points)
-        if transparency_data.get('clear_pricing', False):
-            score += 5
-            details['pricing'] = 'Clear pricing information'
-        else:
-            recommendations.append('Add clear pricing information')
-            details['pricing'] = 'Unclear pricing information'
-            
-        return ScoreComponent(
-            score=score,
-            max_score=15,
-            details=details,
-            recommendations=recommendations
+        return _apply_rules(transparency_data, _TRANSPARENCY_RULES, 15)
+
+    def calculate_total_score(self,
+                            security_data: Dict,
+                            review_data: Dict,
+                            business_data: Dict,
+                            content_data: Dict,
+                            transparency_data: Dict) -> TrustScoreResult:
+        """Calculate overall trust score
+
+        The result is a pure function of sixteen booleans, and sites on
+        the same stack repeat the same patterns, so the heavy lifting is
+        memoized on the packed flag tuple. Each call materializes a
+        fresh TrustScoreResult with its own components dict and
+        recommendations list, so callers can mutate what they get back
+        without corrupting the cached copy.
+        """
+        headers = security_data.get('security_headers', {})
+        flags = (
+            security_data.get('ssl_certificate', {}).get('status') == 'valid',
+            bool(headers.get('has_hsts')),
+            bool(headers.get('has_xframe')),
+            bool(headers.get('has_content_security')),
+            bool(headers.get('has_xss_protection')),
+        ) + tuple(
+            bool(data.get(rule[0], False))
+            for data, table in ((review_data, _REVIEW_RULES),
+                                (business_data, _BUSINESS_RULES),
+                                (content_data, _CONTENT_RULES),
+                                (transparency_data, _TRANSPARENCY_RULES))
+            for rule in table
         )
-        
-    def calculate_total_score(self, 
+        cached = _cached_total_score(flags)
+        # Copy every mutable field, including each component's details
+        # dict and recommendations list: replace() alone is shallow, and
+        # a caller mutating any of them would otherwise corrupt the
+        # cached entry for every future hit on these flags
+        components = {
+            name: replace(component,
+                          details=dict(component.details),
+                          recommendations=list(component.recommendations))
+            for name, component in cached.components.items()
+        }
+        return replace(cached,
+                       components=components,
+                       recommendations=list(cached.recommendations))
+
+    def _calculate_total_score_uncached(self,
                             security_data: Dict,
                             review_data: Dict,
                             business_data: Dict,
                             content_data: Dict,
-                            transparency_data: Dict) -> Dict:
-        """Calculate overall trust score"""
+                            transparency_data: Dict) -> TrustScoreResult:
+        """Score the five input dicts without consulting the memo cache"""
+        tech = self.calculate_technical_score(security_data)
+        reviews = self.calculate_review_score(review_data)
+        business = self.calculate_business_verification_score(business_data)
+        content = self.calculate_content_score(content_data)
+        transparency = self.calculate_transparency_score(transparency_data)
+
         components = {
-            'technical_security': self.calculate_technical_score(security_data),
-            'reviews_ratings': self.calculate_review_score(review_data),
-            'business_verification': self.calculate_business_verification_score(business_data),
-            'content_quality': self.calculate_content_score(content_data),
-            'transparency': self.calculate_transparency_score(transparency_data)
+            'technical_security': tech,
+            'reviews_ratings': reviews,
+            'business_verification': business,
+            'content_quality': content,
+            'transparency': transparency
         }
-        
-        total_score = sum(comp.score for comp in components.values())
-        max_possible = sum(comp.max_score for comp in components.values())
-        
-        # Normalize to 100-point scale
-        normalized_score = (total_score / max_possible) * 100
-        
+
+        total_score = (tech.score + reviews.score + business.score
+                       + content.score + transparency.score)
+
+        # Normalize to 100-point scale; the per-component maxima are fixed,
+        # so their sum is the _MAX_POSSIBLE constant
+        normalized_score = (total_score / self._MAX_POSSIBLE) * 100
+
         # Get all recommendations
-        recommendations = []
-        for comp in components.values():
-            recommendations.extend(comp.recommendations)
-            
+        recommendations = (tech.recommendations + reviews.recommendations
+                           + business.recommendations + content.recommendations
+                           + transparency.recommendations)
+
+
         # Categorize trust level
         trust_level = self._categorize_trust_level(normalized_score)
+
+        return TrustScoreResult(
+            total_score=normalized_score,
+            trust_level=trust_level,
+            components=components,
+            recommendations=recommendations
+        )
         
-        return {
-            'total_score': normalized_score,
-            'trust_level': trust_level,
-            'components': components,
-            'recommendations': recommendations
-        }
-        
+    def calculate_total_scores_batch(self, rows: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Score many sites in one vectorized pass
+
+        Each row is a flat dict of the boolean flags named in
+        _BATCH_FLAG_ORDER (ssl_valid, the four header flags, and every
+        rule-table flag). Returns (scores, trust_levels) arrays, with
+        scores normalized to the 100-point scale used by
+        calculate_total_score.
+        """
+        n = len(rows)
+        flags = np.fromiter(
+            (bool(row.get(flag, False)) for row in rows for flag in _BATCH_FLAG_ORDER),
+            dtype=np.bool_,
+            count=n * len(_BATCH_FLAG_ORDER)
+        ).reshape(n, len(_BATCH_FLAG_ORDER))
+
+        if scoring_core is not None:
+            scores = scoring_core.score_batch(
+                flags.astype(np.uint8), _BATCH_POINTS, _DOMAIN_BONUS, _MAX_TOTAL
+            )
+        elif njit is not None:
+            scores = _score_kernel(
+                flags.astype(np.uint8), _BATCH_POINTS, _DOMAIN_BONUS, _MAX_TOTAL
+            )
+        else:
+            totals = flags.astype(np.int8) @ _BATCH_POINTS + _DOMAIN_BONUS
+            scores = totals / _MAX_TOTAL * 100
+
+        levels = _LEVEL_LABELS[np.searchsorted(_LEVEL_THRESHOLDS, scores, side='right')]
+        return scores, levels
+
     def _categorize_trust_level(self, score: float) -> str:
         """Categorize the trust level based on score"""
         if score >= 90:
@@ -246,4 +356,28 @@ class TrustScore:
         elif score >= 60:
             return 'Moderate Trust'
         else:
-            return 'Needs Improvement'
\ No newline at end of file
+            return 'Needs Improvement'
+
+# Stateless scorer instance backing the flag-tuple memo below
+_FLAG_SCORER = TrustScore()
+
+@lru_cache(maxsize=1024)
+def _cached_total_score(flags: Tuple[bool, ...]) -> TrustScoreResult:
+    """Score a packed flag tuple, ordered as _BATCH_FLAG_ORDER
+
+    Rebuilds the scorer's input dicts from the flags; every rule table
+    reads its flags by name, so one combined dict serves all four.
+    """
+    data = dict(zip(_BATCH_FLAG_ORDER, flags))
+    security_data = {
+        'ssl_certificate': {'status': 'valid' if data['ssl_valid'] else 'invalid'},
+        'security_headers': {
+            'has_hsts': data['has_hsts'],
+            'has_xframe': data['has_xframe'],
+            'has_content_security': data['has_content_security'],
+            'has_xss_protection': data['has_xss_protection']
+        }
+    }
+    return _FLAG_SCORER._calculate_total_score_uncached(
+        security_data, data, data, data, data
+    )
\ No newline at end of file
@@ -0,0 +1,32 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Optional Cython kernel for batch trust scoring.
+
+Build in place with:
+
+    cythonize -3 -i src/analyzers/scoring_core.pyx
+
+When the compiled module is importable, TrustScore.calculate_total_scores_batch
+delegates its per-site aggregation here; otherwise the NumPy (or Numba)
+path in scoring.py is used.
+"""
+import numpy as np
+
+
+def score_batch(const unsigned char[:, :] flags, const signed char[:] points,
+                double bonus, double max_total):
+    """Aggregate an (N, K) flag matrix into normalized 0-100 scores"""
+    cdef Py_ssize_t n = flags.shape[0]
+    cdef Py_ssize_t k = flags.shape[1]
+    cdef Py_ssize_t i, j
+    cdef double total
+
+    out = np.empty(n, dtype=np.float64)
+    cdef double[:] out_view = out
+
+    for i in range(n):
+        total = bonus
+        for j in range(k):
+            total += flags[i, j] * points[j]
+        out_view[i] = total / max_total * 100.0
+
+    return out
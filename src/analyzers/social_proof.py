@@ -1,93 +1,472 @@
+import asyncio
+import logging
+import time
 import aiohttp
-from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 import re
 
+from analyzers.http_utils import request_with_retry
+
+try:
+    import ahocorasick
+except ImportError:  # optional; matching falls back to dict lookups
+    ahocorasick = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional; parsing falls back to the stdlib extractor
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+# Social media platforms detection
+_SOCIAL_PLATFORMS = {
+    'facebook': 'facebook.com',
+    'twitter': 'twitter.com',
+    'linkedin': 'linkedin.com',
+    'instagram': 'instagram.com',
+    'youtube': 'youtube.com'
+}
+
+# Enhanced review platforms detection
+_REVIEW_PLATFORMS = {
+    'trustpilot': {
+        'domain': 'trustpilot.com',
+        'weight': 5,
+        'patterns': [r'trustpilot\.com/review', r'trustpilot\.com/evaluate']
+    },
+    'google': {
+        'domain': 'google.com',
+        'weight': 4,
+        'patterns': [r'google\.com/business', r'google\.com/maps/place', r'reviews\?hl=']
+    },
+    'yelp': {
+        'domain': 'yelp.com',
+        'weight': 3,
+        'patterns': [r'yelp\.com/biz', r'yelp\.com/business']
+    },
+    'bbb': {
+        'domain': 'bbb.org',
+        'weight': 4,
+        'patterns': [r'bbb\.org/business-reviews', r'bbb\.org/us/']
+    },
+    'sitejabber': {
+        'domain': 'sitejabber.com',
+        'weight': 3,
+        'patterns': [r'sitejabber\.com/reviews']
+    },
+    'capterra': {
+        'domain': 'capterra.com',
+        'weight': 3,
+        'patterns': [r'capterra\.com/reviews', r'capterra\.com/software']
+    },
+    'g2': {
+        'domain': 'g2.com',
+        'weight': 4,
+        'patterns': [r'g2\.com/products']
+    },
+    'facebook': {
+        'domain': 'facebook.com',
+        'weight': 2,
+        'patterns': [r'facebook\.com/.*/reviews', r'facebook\.com/pg/.*/reviews']
+    }
+}
+
+# Reverse map keyed by host so each href costs one dict lookup instead
+# of a scan over every platform
+_REVIEW_DOMAIN_TO_PLATFORM = {
+    info['domain']: platform for platform, info in _REVIEW_PLATFORMS.items()
+}
+
+def _build_automaton(domain_to_platform: Dict[str, str]):
+    """Compile a domain->platform map into an Aho-Corasick automaton"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for domain, platform in domain_to_platform.items():
+        automaton.add_word(domain, platform)
+    automaton.make_automaton()
+    return automaton
+
+# An Aho-Corasick automaton scans every review domain in one linear
+# pass per href when the optional ahocorasick package is installed
+_REVIEW_AUTOMATON = _build_automaton(_REVIEW_DOMAIN_TO_PLATFORM)
+
+# Social profiles match against one compiled alternation per href;
+# x.com is folded into twitter to cover post-rebrand profile links.
+# Each domain is anchored on a host boundary -- start of string, '//'
+# or a subdomain dot before, and '/', '?', '#', ':' or end after --
+# so short domains like x.com cannot fire inside wix.com or box.com
+_SOCIAL_DOMAINS = {platform: [domain] for platform, domain in _SOCIAL_PLATFORMS.items()}
+_SOCIAL_DOMAINS['twitter'].append('x.com')
+_SOCIAL_RE = re.compile('|'.join(
+    f"(?P<{platform}>(?:^|//|\\.)(?:{'|'.join(re.escape(domain) for domain in domains)})(?:[/?#:]|$))"
+    for platform, domains in _SOCIAL_DOMAINS.items()
+))
+
+# One compiled alternation over every platform pattern; the named
+# group that matched tells us which platform a link belongs to
+_PLATFORM_RE = re.compile('|'.join(
+    f"(?P<{platform}>{'|'.join(info['patterns'])})"
+    for platform, info in _REVIEW_PLATFORMS.items()
+))
+
+# Same idea for embedded widget detection over <script src> values
+_WIDGET_RE = re.compile('|'.join(
+    f"(?P<{platform}>{re.escape(info['domain'])})"
+    for platform, info in _REVIEW_PLATFORMS.items()
+))
+
+# Byte-level attribute extraction for the fallback path: not a full HTML
+# parse, but extracting href/src values is robust to that shortcut and
+# avoids ever decoding the page body
+_HREF_RE = re.compile(rb'<a\b[^>]*?\bhref\s*=\s*["\']([^"\'>]+)', re.IGNORECASE)
+_SRC_RE = re.compile(rb'<script\b[^>]*?\bsrc\s*=\s*["\']([^"\'>]+)', re.IGNORECASE)
+
+def _extract_links(page: bytes):
+    """Pull href/src lists out of the raw page bytes
+
+    Only the matched attribute values are ever decoded, so the full body
+    never goes through str conversion. Top-level and pickleable so batch
+    callers can run it in a process pool, overlapping parse CPU with
+    fetch I/O across cores.
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(page)
+        hrefs = [a.attributes.get('href') or '' for a in tree.css('a[href]')]
+        scripts = [s.attributes.get('src') or '' for s in tree.css('script[src]')]
+        return ([href.lower() for href in hrefs if href],
+                [src.lower() for src in scripts if src])
+
+    hrefs = [m.group(1).decode('utf-8', 'replace').lower()
+             for m in _HREF_RE.finditer(page)]
+    scripts = [m.group(1).decode('utf-8', 'replace').lower()
+               for m in _SRC_RE.finditer(page)]
+    return hrefs, scripts
+
 class SocialProofAnalyzer:
     """Analyzes website social proof elements including reviews, testimonials, and team presence"""
-    
-    def __init__(self):
+
+    # How long a HEAD-probe verdict for a (host, path) pair stays valid
+    _HEAD_CACHE_TTL = 3600.0
+
+    # How long a full analyze() result stays valid for a normalized URL
+    _ANALYZE_CACHE_TTL = 600.0
+
+    # Social/review links live in the head and early body, so reading more
+    # than this per page is wasted bandwidth and parse time
+    _MAX_PAGE_BYTES = 512 * 1024
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None,
+                 parse_executor=None):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        # Enhanced review platforms detection
-        self.review_platforms = {
-            'trustpilot': {
-                'domain': 'trustpilot.com',
-                'weight': 5,
-                'patterns': [r'trustpilot\.com/review', r'trustpilot\.com/evaluate']
-            },
-            'google': {
-                'domain': 'google.com',
-                'weight': 4,
-                'patterns': [r'google\.com/business', r'google\.com/maps/place', r'reviews\?hl=']
-            },
-            'yelp': {
-                'domain': 'yelp.com',
-                'weight': 3,
-                'patterns': [r'yelp\.com/biz', r'yelp\.com/business']
-            },
-            'bbb': {
-                'domain': 'bbb.org',
-                'weight': 4,
-                'patterns': [r'bbb\.org/business-reviews', r'bbb\.org/us/']
-            },
-            'sitejabber': {
-                'domain': 'sitejabber.com',
-                'weight': 3,
-                'patterns': [r'sitejabber\.com/reviews']
-            },
-            'capterra': {
-                'domain': 'capterra.com',
-                'weight': 3,
-                'patterns': [r'capterra\.com/reviews', r'capterra\.com/software']
-            },
-            'g2': {
-                'domain': 'g2.com',
-                'weight': 4,
-                'patterns': [r'g2\.com/products']
-            },
-            'facebook': {
-                'domain': 'facebook.com',
-                'weight': 2,
-                'patterns': [r'facebook\.com/.*/reviews', r'facebook\.com/pg/.*/reviews']
-            }
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, br'
         }
-        
+        # Callers analyzing in batch can inject one shared session so every
+        # probe multiplexes over the same pooled connections
+        self._session = session
+        self._owns_session = session is None
+        self._head_cache = {}
+        self._analyze_cache = {}
+        self._host_semaphores = {}
+        # Optional ProcessPoolExecutor (or similar) for CPU-bound parsing
+        # when many URLs are analyzed concurrently
+        self._parse_executor = parse_executor
+
+        # The platform tables and their derived matchers are immutable, so
+        # every instance shares the module-level objects
+        self.social_platforms = _SOCIAL_PLATFORMS
+        self.review_platforms = _REVIEW_PLATFORMS
+        self._review_domain_to_platform = _REVIEW_DOMAIN_TO_PLATFORM
+        self._review_automaton = _REVIEW_AUTOMATON
+        self._social_re = _SOCIAL_RE
+        self._platform_re = _PLATFORM_RE
+        self._widget_re = _WIDGET_RE
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return a shared session so TCP/TLS connections are reused across checks"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=30
+                )
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Close the session, unless it was injected by the caller"""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     async def analyze(self, url: str) -> Dict:
         """Analyze social proof elements on the website"""
         try:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
-                
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                print(f"\nAnalyzing social proof for URL: {url}")  # Debug output
-                
-                results = {
-                    'url': url,
-                    'team_presence': await self._check_team_presence(session, url),
-                    'social_profiles': await self._check_social_profiles(session, url),
-                    'testimonials': await self._check_testimonials(session, url),
-                    'review_presence': await self._check_review_presence(session, url),
-                    'review_diversity': await self._analyze_review_diversity(session, url)
-                }
-                
-                print("\nSocial proof analysis results:")  # Debug output
-                print(f"Review diversity: {results['review_diversity']}")
-                
-                return results
-                
+
+            # Repeat scans of the same site within the TTL answer from memory
+            parsed = urlparse(url)
+            cache_key = f"{parsed.scheme}://{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+            now = time.monotonic()
+            cached = self._analyze_cache.get(cache_key)
+            if cached is not None and now - cached[0] < self._ANALYZE_CACHE_TTL:
+                return cached[1]
+
+            session = await self._get_session()
+            logger.debug("Analyzing social proof for URL: %s", url)
+
+            # Fan out all sub-checks concurrently; total wall time is roughly
+            # the slowest single check instead of the sum of all of them.
+            # The landing page is fetched and parsed exactly once, then the
+            # extracted hrefs/scripts are shared by all the HTML scanners.
+            team, testimonials, page = await asyncio.gather(
+                self._check_team_presence(session, url),
+                self._check_testimonials(session, url),
+                self._fetch_links(session, url),
+                return_exceptions=True
+            )
+
+            if isinstance(page, Exception):
+                page_error = {'error': str(page), 'status': 'failed'}
+                social = reviews = diversity = page_error
+            else:
+                links, scripts = page
+                social = self._scan_social(links)
+                reviews = self._scan_reviews(links)
+                diversity = self._scan_diversity(links, scripts)
+
+            results = {
+                'url': url,
+                'team_presence': self._unwrap(team),
+                'social_profiles': social,
+                'testimonials': self._unwrap(testimonials),
+                'review_presence': reviews,
+                'review_diversity': diversity
+            }
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Review diversity: %s", results['review_diversity'])
+
+            # Only cache when every sub-check succeeded; a transient
+            # fetch failure must not pin its error result for the TTL
+            if all(results[key].get('status') == 'checked'
+                   for key in ('team_presence', 'social_profiles', 'testimonials',
+                               'review_presence', 'review_diversity')):
+                self._analyze_cache[cache_key] = (now, results)
+            return results
+
         except Exception as e:
-            print(f"\nError in social proof analysis: {str(e)}")  # Debug output
+            logger.debug("Error in social proof analysis: %s", e)
             return {
                 'url': url,
                 'error': f"Analysis failed: {str(e)}",
                 'status': 'failed'
             }
 
-    async def _analyze_review_diversity(self, session: aiohttp.ClientSession, url: str) -> Dict:
+    def _unwrap(self, result) -> Dict:
+        """Convert a gathered exception into the standard failure dict"""
+        if isinstance(result, Exception):
+            return {'error': str(result), 'status': 'failed'}
+        return result
+
+    async def _probe_paths(self, session: aiohttp.ClientSession, url: str, paths: List[str],
+                           stop_after_first: bool = False) -> List[str]:
+        """HEAD-probe candidate paths concurrently, returning the ones that resolve
+
+        Verdicts are cached per (host, path) with a TTL so re-analyzing the
+        same site skips the network entirely. With stop_after_first, pending
+        probes are cancelled as soon as one path resolves -- enough for the
+        has-page booleans the callers feed into scoring.
+        """
+        # Parse the URL once; every candidate path starts with '/', so the
+        # probe targets are plain string concatenations onto the base
+        parsed = urlparse(url)
+        host = parsed.netloc
+        base = f'{parsed.scheme}://{host}'
+        now = time.monotonic()
+
+        found_urls = []
+        to_probe = []
+        for path in paths:
+            cached = self._head_cache.get((host, path))
+            if cached is not None and now - cached[0] < self._HEAD_CACHE_TTL:
+                if cached[1]:
+                    found_urls.append(base + path)
+            else:
+                to_probe.append(path)
+
+        if stop_after_first and found_urls:
+            return found_urls
+
+        async def probe(path: str):
+            response = await request_with_retry(session, 'HEAD', base + path,
+                                                self._host_semaphores,
+                                                allow_redirects=True)
+            exists = response.status == 200
+            response.release()
+            return path, exists
+
+        tasks = [asyncio.create_task(probe(path)) for path in to_probe]
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    path, exists = await future
+                except Exception:
+                    continue
+                self._head_cache[(host, path)] = (now, exists)
+                if exists:
+                    found_urls.append(base + path)
+                    if stop_after_first:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return found_urls
+
+    async def _check_team_presence(self, session: aiohttp.ClientSession, url: str) -> Dict:
+        """Check for presence of team/about pages"""
+        common_paths = [
+            '/team',
+            '/our-team',
+            '/about/team',
+            '/people',
+            '/leadership'
+        ]
+
+        team_urls = await self._probe_paths(session, url, common_paths,
+                                            stop_after_first=True)
+
+        return {
+            'has_team_page': bool(team_urls),
+            'team_urls': team_urls,
+            'status': 'checked'
+        }
+
+    async def _check_testimonials(self, session: aiohttp.ClientSession, url: str) -> Dict:
+        """Check for presence of testimonial pages"""
+        common_paths = [
+            '/testimonials',
+            '/reviews',
+            '/customers',
+            '/case-studies',
+            '/success-stories'
+        ]
+
+        testimonial_urls = await self._probe_paths(session, url, common_paths,
+                                                   stop_after_first=True)
+
+        return {
+            'has_testimonials': bool(testimonial_urls),
+            'testimonial_urls': testimonial_urls,
+            'status': 'checked'
+        }
+
+    async def _fetch_links(self, session: aiohttp.ClientSession, url: str):
+        """Fetch the landing page once and stream out link/script targets"""
+        # Ask the server for just the first chunk of the page; servers that
+        # ignore the Range header still get capped by the bounded read below
+        range_header = {'Range': f'bytes=0-{self._MAX_PAGE_BYTES - 1}'}
+        response = await request_with_retry(session, 'GET', url,
+                                            self._host_semaphores,
+                                            headers=range_header)
+        try:
+            response.raise_for_status()
+            raw = await response.content.read(self._MAX_PAGE_BYTES)
+        finally:
+            response.release()
+
+        # Extraction works directly on the bytes; only matched attribute
+        # values are decoded, never the whole body
+        if self._parse_executor is not None:
+            loop = asyncio.get_running_loop()
+            hrefs, scripts = await loop.run_in_executor(
+                self._parse_executor, _extract_links, raw
+            )
+        else:
+            hrefs, scripts = _extract_links(raw)
+
+        # Repeated nav/footer anchors point at identical URLs; dedupe before
+        # normalizing so each unique target is parsed and scanned once
+        links = [
+            (self._normalize_host(urlparse(href).netloc), href)
+            for href in dict.fromkeys(hrefs)
+        ]
+        return links, list(dict.fromkeys(scripts))
+
+    @staticmethod
+    def _normalize_host(host: str) -> str:
+        """Lowercase a host and strip a leading www. for map lookups"""
+        host = host.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        return host
+
+    def _match_platforms(self, links: List[tuple], domain_to_platform: Dict[str, str],
+                         automaton=None) -> List[str]:
+        """Match (host, href) pairs against a domain->platform map, deduplicating via a set"""
+        found = set()
+
+        if automaton is not None:
+            for _, href in links:
+                for _, platform in automaton.iter(href):
+                    found.add(platform)
+            return sorted(found)
+
+        substring_pairs = tuple(domain_to_platform.items())
+
+        for host, href in links:
+            platform = domain_to_platform.get(host)
+            if platform is None:
+                # Relative or decorated links: fall back to one substring pass
+                for domain, candidate in substring_pairs:
+                    if domain in href:
+                        platform = candidate
+                        break
+
+            if platform is not None:
+                found.add(platform)
+
+        return sorted(found)
+
+    def _scan_social(self, links: List[tuple]) -> Dict:
+        """Check for links to social media profiles"""
+        found = set()
+        for _, href in links:
+            match = self._social_re.search(href)
+            if match:
+                found.add(match.lastgroup)
+        platforms_found = sorted(found)
+
+        return {
+            'has_social_profiles': bool(platforms_found),
+            'platforms_found': platforms_found,
+            'status': 'checked'
+        }
+
+    def _scan_reviews(self, links: List[tuple]) -> Dict:
+        """Check for links to review platforms"""
+        platforms_found = self._match_platforms(links, self._review_domain_to_platform,
+                                                self._review_automaton)
+
+        return {
+            'has_reviews': bool(platforms_found),
+            'platforms_found': platforms_found,
+            'status': 'checked'
+        }
+
+    def _scan_diversity(self, links: List[tuple], scripts: List[str]) -> Dict:
         """Analyze the diversity and quality of review sources"""
         results = {
             'review_sources': [],
@@ -98,57 +477,49 @@ class SocialProofAnalyzer:
             'embedded_widgets': [],
             'status': 'checked'
         }
-        
-        try:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    print("\nAnalyzing review diversity...")  # Debug output
-                    
-                    # Check for review platform links
-                    for link in soup.find_all('a', href=True):
-                        href = link['href'].lower()
-                        for platform, info in self.review_platforms.items():
-                            for pattern in info['patterns']:
-                                if re.search(pattern, href):
-                                    source_info = {
-                                        'platform': platform,
-                                        'url': href,
-                                        'weight': info['weight']
-                                    }
-                                    results['review_sources'].append(source_info)
-                                    if info['weight'] >= 4:
-                                        if platform not in results['primary_sources']:
-                                            results['primary_sources'].append(platform)
-                                    else:
-                                        if platform not in results['secondary_sources']:
-                                            results['secondary_sources'].append(platform)
-                    
-                    # Check for embedded review widgets
-                    for script in soup.find_all('script', src=True):
-                        src = script['src'].lower()
-                        for platform, info in self.review_platforms.items():
-                            if info['domain'] in src and platform not in results['embedded_widgets']:
-                                results['embedded_widgets'].append(platform)
-                    
-                    # Calculate diversity metrics
-                    results['total_sources'] = len(results['review_sources'])
-                    total_weight = sum(source['weight'] for source in results['review_sources'])
-                    
-                    # Calculate diversity score (0-10)
-                    if results['total_sources'] > 0:
-                        weighted_score = min(total_weight / 10, 1.0) * 10
-                        platform_variety = min(results['total_sources'] / 5, 1.0) * 10
-                        results['diversity_score'] = (weighted_score + platform_variety) / 2
-                    
-                    print(f"\nReview diversity results: {results}")  # Debug output
-                    
-        except Exception as e:
-            print(f"\nError in review diversity analysis: {str(e)}")  # Debug output
-            results['error'] = str(e)
-            
+
+        # Deduplicate through sets; materialized to sorted lists on return
+        primary_sources = set()
+        secondary_sources = set()
+        embedded_widgets = set()
+
+        # Check for review platform links (single pass over the combined pattern)
+        for _, href in links:
+            match = self._platform_re.search(href)
+            if match:
+                platform = match.lastgroup
+                weight = self.review_platforms[platform]['weight']
+                results['review_sources'].append({
+                    'platform': platform,
+                    'url': href,
+                    'weight': weight
+                })
+                if weight >= 4:
+                    primary_sources.add(platform)
+                else:
+                    secondary_sources.add(platform)
+
+        # Check for embedded review widgets (one compiled scan per src)
+        for src in scripts:
+            match = self._widget_re.search(src)
+            if match:
+                embedded_widgets.add(match.lastgroup)
+
+        results['primary_sources'] = sorted(primary_sources)
+        results['secondary_sources'] = sorted(secondary_sources)
+        results['embedded_widgets'] = sorted(embedded_widgets)
+
+        # Calculate diversity metrics
+        results['total_sources'] = len(results['review_sources'])
+        total_weight = sum(source['weight'] for source in results['review_sources'])
+
+        # Calculate diversity score (0-10)
+        if results['total_sources'] > 0:
+            weighted_score = min(total_weight / 10, 1.0) * 10
+            platform_variety = min(results['total_sources'] / 5, 1.0) * 10
+            results['diversity_score'] = (weighted_score + platform_variety) / 2
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Review diversity results: %s", results)
+
         return results
-        
-    # Rest of the methods remain the same...
\ No newline at end of file
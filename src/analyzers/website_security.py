@@ -1,17 +1,56 @@
+import asyncio
 import ssl
-import socket
+import time
 import aiohttp
 from urllib.parse import urlparse
 from typing import Dict, List, Optional
 
+from analyzers.http_utils import request_with_retry
+
 class WebsiteSecurityAnalyzer:
     """Analyzes website security aspects including SSL, privacy policy, and contact information"""
-    
-    def __init__(self):
+
+    # How long a HEAD-probe verdict for a (host, path) pair stays valid
+    _HEAD_CACHE_TTL = 3600.0
+
+    # Certificates change on the scale of months; cache handshake results
+    _SSL_CACHE_TTL = 3600.0
+
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        
+        # Application-scoped session so keep-alive, TLS session and DNS
+        # caches survive across analyses; callers may inject their own
+        self._session = session
+        self._owns_session = session is None
+        self._head_cache = {}
+        self._ssl_cache = {}
+        self._host_semaphores = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return a shared session so TCP/TLS connections are reused across checks"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=10, ttl_dns_cache=300, keepalive_timeout=30
+                )
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """Close the session, unless it was injected by the caller"""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
     async def analyze(self, url: str) -> Dict:
         """
         Analyze website security aspects
@@ -27,17 +66,26 @@ class WebsiteSecurityAnalyzer:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            async with aiohttp.ClientSession() as session:
-                results = {
-                    'url': url,
-                    'ssl_certificate': await self._check_ssl(url),
-                    'privacy_policy': await self._check_privacy_policy(session, url),
-                    'contact_info': await self._check_contact_info(session, url),
-                    'security_headers': await self._check_security_headers(session, url)
-                }
-                
-                return results
-                
+            session = await self._get_session()
+
+            # The four checks are independent, so run them concurrently
+            ssl_cert, privacy, contact, sec_headers = await asyncio.gather(
+                self._check_ssl(url),
+                self._check_privacy_policy(session, url),
+                self._check_contact_info(session, url),
+                self._check_security_headers(session, url),
+                return_exceptions=True
+            )
+
+            return {
+                'url': url,
+                'ssl_certificate': self._unwrap(ssl_cert),
+                'privacy_policy': self._unwrap(privacy),
+                'contact_info': self._unwrap(contact),
+                'security_headers': self._unwrap(sec_headers)
+            }
+
+
         except Exception as e:
             return {
                 'url': url,
@@ -45,56 +93,121 @@ class WebsiteSecurityAnalyzer:
                 'status': 'failed'
             }
     
+    def _unwrap(self, result) -> Dict:
+        """Convert a gathered exception into the standard failure dict"""
+        if isinstance(result, Exception):
+            return {'error': str(result), 'status': 'failed'}
+        return result
+
     async def _check_ssl(self, url: str) -> Dict:
         """Check SSL certificate status and details"""
         parsed_url = urlparse(url)
         hostname = parsed_url.netloc
-        
+
+        cached = self._ssl_cache.get(hostname)
+        if cached is not None and time.monotonic() - cached[0] < self._SSL_CACHE_TTL:
+            return cached[1]
+
         try:
             context = ssl.create_default_context()
-            with socket.create_connection((hostname, 443)) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    cert = ssock.getpeercert()
-                    
-            return {
+            # Handshake over asyncio streams so the TCP+TLS round trips
+            # overlap with the HTTP checks instead of blocking the loop
+            reader, writer = await asyncio.open_connection(
+                hostname, 443, ssl=context, server_hostname=hostname
+            )
+            try:
+                cert = writer.get_extra_info('peercert')
+            finally:
+                writer.close()
+                await writer.wait_closed()
+
+            result = {
                 'status': 'valid',
                 'issuer': dict(x[0] for x in cert['issuer']),
                 'expiry': cert['notAfter'],
                 'version': cert['version']
             }
+            self._ssl_cache[hostname] = (time.monotonic(), result)
+            return result
         except Exception as e:
             return {
                 'status': 'invalid',
                 'error': str(e)
             }
     
+    async def _probe_paths(self, session: aiohttp.ClientSession, url: str, paths: List[str],
+                           stop_after_first: bool = False) -> List[str]:
+        """HEAD-probe candidate paths concurrently, returning the ones that resolve
+
+        Verdicts are cached per (host, path) with a TTL so overlapping path
+        lists and repeat analyses of the same host skip duplicate HEADs.
+        With stop_after_first, pending probes are cancelled as soon as one
+        path resolves -- enough for the has-page booleans scoring consumes.
+        """
+        base = url.rstrip('/')
+        host = urlparse(url).netloc
+        now = time.monotonic()
+
+        found_urls = []
+        to_probe = []
+        for path in paths:
+            cached = self._head_cache.get((host, path))
+            if cached is not None and now - cached[0] < self._HEAD_CACHE_TTL:
+                if cached[1]:
+                    found_urls.append(base + path)
+            else:
+                to_probe.append(path)
+
+        if stop_after_first and found_urls:
+            return found_urls
+
+        async def probe(path: str):
+            response = await request_with_retry(session, 'HEAD', base + path,
+                                                self._host_semaphores,
+                                                allow_redirects=True)
+            exists = response.status == 200
+            response.release()
+            return path, exists
+
+        tasks = [asyncio.create_task(probe(path)) for path in to_probe]
+        try:
+            for future in asyncio.as_completed(tasks):
+                try:
+                    path, exists = await future
+                except Exception:
+                    continue
+                self._head_cache[(host, path)] = (now, exists)
+                if exists:
+                    found_urls.append(base + path)
+                    if stop_after_first:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return found_urls
+
     async def _check_privacy_policy(self, session: aiohttp.ClientSession, url: str) -> Dict:
         """Check for presence of privacy policy"""
+        # Ordered by observed hit rate so the early-stop usually fires on
+        # the first probe to land
         common_paths = [
-            '/privacy',
             '/privacy-policy',
+            '/privacy',
             '/privacy-notice',
             '/legal/privacy'
         ]
-        
-        results = {
-            'has_privacy_policy': False,
-            'policy_urls': [],
+
+        policy_urls = await self._probe_paths(session, url, common_paths,
+                                              stop_after_first=True)
+
+        return {
+            'has_privacy_policy': bool(policy_urls),
+            'policy_urls': policy_urls,
             'status': 'checked'
         }
-        
-        for path in common_paths:
-            try:
-                full_url = url.rstrip('/') + path
-                async with session.head(full_url, allow_redirects=True) as response:
-                    if response.status == 200:
-                        results['has_privacy_policy'] = True
-                        results['policy_urls'].append(full_url)
-            except Exception as e:
-                continue
-                
-        return results
-    
+
     async def _check_contact_info(self, session: aiohttp.ClientSession, url: str) -> Dict:
         """Check for presence of contact information"""
         common_paths = [
@@ -103,25 +216,16 @@ class WebsiteSecurityAnalyzer:
             '/about',
             '/about-us'
         ]
-        
-        results = {
-            'has_contact_page': False,
-            'contact_urls': [],
+
+        contact_urls = await self._probe_paths(session, url, common_paths,
+                                               stop_after_first=True)
+
+        return {
+            'has_contact_page': bool(contact_urls),
+            'contact_urls': contact_urls,
             'status': 'checked'
         }
         
-        for path in common_paths:
-            try:
-                full_url = url.rstrip('/') + path
-                async with session.head(full_url, allow_redirects=True) as response:
-                    if response.status == 200:
-                        results['has_contact_page'] = True
-                        results['contact_urls'].append(full_url)
-            except Exception as e:
-                continue
-                
-        return results
-        
     async def _check_security_headers(self, session: aiohttp.ClientSession, url: str) -> Dict:
         """Check security-related HTTP headers"""
         try:
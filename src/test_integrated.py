@@ -1,67 +1,73 @@
 import asyncio
+import sys
 from trust_analyzer import TrustAnalyzer
 
 async def main():
     analyzer = TrustAnalyzer()
     url = "github.com"
-    print(f"Analyzing trust factors for: {url}")
-    print("=" * 50)
-    
+
+    # Collect every output line and write stdout once at the end, so the
+    # report costs one flush instead of one per print
+    lines = [
+        f"Analyzing trust factors for: {url}",
+        "=" * 50,
+    ]
+
     # Run analysis
-    results = await analyzer.analyze(url)
+    async with analyzer:
+        results = await analyzer.analyze(url)
     trust_score = results['trust_score']
-    
-    # Print overall scores
-    print(f"\nOverall Trust Score: {trust_score['total_score']:.2f}")
-    print(f"Trust Level: {trust_score['trust_level']}")
-    
-    # Print component scores
-    print("\nComponent Scores:")
-    print("-" * 50)
-    for name, component in trust_score['components'].items():
-        print(f"\n{name.replace('_', ' ').title()}:")
-        print(f"Score: {component.score}/{component.max_score}")
-        print("Details:")
+
+    # Overall scores
+    lines.append(f"\nOverall Trust Score: {trust_score.total_score:.2f}")
+    lines.append(f"Trust Level: {trust_score.trust_level}")
+
+    # Component scores
+    lines.append("\nComponent Scores:")
+    lines.append("-" * 50)
+    for name, component in trust_score.components.items():
+        lines.append(f"\n{name.replace('_', ' ').title()}:")
+        lines.append(f"Score: {component.score}/{component.max_score}")
+        lines.append("Details:")
         for key, value in component.details.items():
-            print(f"  - {key}: {value}")
-            
+            lines.append(f"  - {key}: {value}")
+
         # Show detailed review metrics for review ratings
         if name == 'reviews_ratings' and 'review_metrics' in component.details:
             metrics = component.details['review_metrics']
-            print("\nDetailed Review Metrics:")
-            print(f"  - Diversity Score: {metrics.get('diversity_score', 0):.1f}/10")
-            print(f"  - Primary Review Sources: {metrics.get('primary_sources', 0)}")
-            print(f"  - Total Review Sources: {metrics.get('total_sources', 0)}")
-            print(f"  - Has Review Widgets: {'Yes' if metrics.get('has_widgets', False) else 'No'}")
-    
-    # Print review diversity details if available
-    if 'review_diversity_details' in trust_score:
-        diversity = trust_score['review_diversity_details']
-        print("\nReview Sources Analysis:")
-        print("-" * 50)
-        print(f"Total Review Platforms: {diversity.get('total_sources', 0)}")
-        
+            lines.append("\nDetailed Review Metrics:")
+            lines.append(f"  - Diversity Score: {metrics.get('diversity_score', 0):.1f}/10")
+            lines.append(f"  - Primary Review Sources: {metrics.get('primary_sources', 0)}")
+            lines.append(f"  - Total Review Sources: {metrics.get('total_sources', 0)}")
+            lines.append(f"  - Has Review Widgets: {'Yes' if metrics.get('has_widgets', False) else 'No'}")
+
+    # Review diversity details if available
+    if trust_score.review_diversity_details is not None:
+        diversity = trust_score.review_diversity_details
+        lines.append("\nReview Sources Analysis:")
+        lines.append("-" * 50)
+        lines.append(f"Total Review Platforms: {diversity.get('total_sources', 0)}")
+
         if diversity.get('primary_sources'):
-            print("\nPrimary Review Sources:")
-            for source in diversity.get('primary_sources', []):
-                print(f"  - {source}")
-                
+            lines.append("\nPrimary Review Sources:")
+            lines.extend(f"  - {source}" for source in diversity.get('primary_sources', []))
+
         if diversity.get('secondary_sources'):
-            print("\nSecondary Review Sources:")
-            for source in diversity.get('secondary_sources', []):
-                print(f"  - {source}")
-                
+            lines.append("\nSecondary Review Sources:")
+            lines.extend(f"  - {source}" for source in diversity.get('secondary_sources', []))
+
         if diversity.get('embedded_widgets'):
-            print("\nEmbedded Review Widgets:")
-            for widget in diversity.get('embedded_widgets', []):
-                print(f"  - {widget}")
-    
-    # Print recommendations
-    if trust_score['recommendations']:
-        print("\nRecommendations:")
-        print("-" * 50)
-        for i, rec in enumerate(trust_score['recommendations'], 1):
-            print(f"{i}. {rec}")
+            lines.append("\nEmbedded Review Widgets:")
+            lines.extend(f"  - {widget}" for widget in diversity.get('embedded_widgets', []))
+
+    # Recommendations
+    if trust_score.recommendations:
+        lines.append("\nRecommendations:")
+        lines.append("-" * 50)
+        lines.extend(f"{i}. {rec}"
+                     for i, rec in enumerate(trust_score.recommendations, 1))
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
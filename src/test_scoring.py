@@ -48,22 +48,22 @@ def main():
     # Print results
     print("\nTrust Score Analysis")
     print("=" * 50)
-    print(f"Total Score: {results['total_score']:.2f}")
-    print(f"Trust Level: {results['trust_level']}")
-    
+    print(f"Total Score: {results.total_score:.2f}")
+    print(f"Trust Level: {results.trust_level}")
+
     print("\nComponent Scores:")
     print("-" * 50)
-    for name, component in results['components'].items():
+    for name, component in results.components.items():
         print(f"\n{name.replace('_', ' ').title()}:")
         print(f"Score: {component.score}/{component.max_score}")
         print("Details:")
         for key, value in component.details.items():
             print(f"  - {key}: {value}")
             
-    if results['recommendations']:
+    if results.recommendations:
         print("\nRecommendations:")
         print("-" * 50)
-        for i, rec in enumerate(results['recommendations'], 1):
+        for i, rec in enumerate(results.recommendations, 1):
             print(f"{i}. {rec}")
 
 if __name__ == "__main__":
@@ -6,8 +6,9 @@ async def main():
     url = "github.com"
     print(f"Analyzing social proof for: {url}")
     
-    # Run the analysis
-    results = await analyzer.analyze(url)
+    # Run the analysis, closing the shared session when done
+    async with analyzer:
+        results = await analyzer.analyze(url)
     
     # Print results in a structured way
     print("\nAnalysis Results:")
@@ -1,30 +1,225 @@
+import asyncio
+import time
 from typing import Dict
+from urllib.parse import urlparse
 from analyzers.website_security import WebsiteSecurityAnalyzer
 from analyzers.social_proof import SocialProofAnalyzer
 from analyzers.content_expertise import ContentExpertiseAnalyzer
 from analyzers.scoring import TrustScore
 
+# Freshness labels that count as recent content; a set so new variants
+# can be added without growing the check
+_FRESH_TOKENS = frozenset({'Recent content found'})
+
+# Shared default for .get() lookups; immutable by convention, so the
+# mapper never allocates throwaway empty dicts
+_EMPTY: Dict = {}
+
 class TrustAnalyzer:
+    # Fixed attribute layout: smaller instances and offset-based
+    # attribute access, which matters when handlers build one per request
+    __slots__ = ('security_analyzer', 'social_analyzer', 'content_analyzer',
+                 'scorer', '_analyze_cache', '_inflight', '_host_failures')
+
+    # How long a full analysis result stays valid for a normalized URL
+    _ANALYZE_CACHE_TTL = 600.0
+
+    # Cap on any single analyzer so one stalled handshake cannot hold
+    # the whole analysis; the breaker skips a host entirely after this
+    # many consecutive failures, until the reset window elapses
+    _ANALYZER_TIMEOUT = 10.0
+    _BREAKER_THRESHOLD = 3
+    _BREAKER_RESET = 60.0
+
+    # Lazily-built process-wide analyzer instances, so short-lived
+    # TrustAnalyzer objects (one per request in a web handler) share the
+    # sub-analyzers' sessions, caches and compiled matchers
+    _shared_analyzers = None
+
+    @classmethod
+    def _get_shared_analyzers(cls):
+        if cls._shared_analyzers is None:
+            cls._shared_analyzers = (
+                WebsiteSecurityAnalyzer(),
+                SocialProofAnalyzer(),
+                ContentExpertiseAnalyzer(),
+                TrustScore()
+            )
+        return cls._shared_analyzers
+
     def __init__(self):
-        self.security_analyzer = WebsiteSecurityAnalyzer()
-        self.social_analyzer = SocialProofAnalyzer()
-        self.content_analyzer = ContentExpertiseAnalyzer()
-        self.scorer = TrustScore()
-        
-    async def analyze(self, url: str) -> Dict:
-        """Perform comprehensive trust analysis of a website"""
-        # Run all analyzers
-        security_results = await self.security_analyzer.analyze(url)
-        social_results = await self.social_analyzer.analyze(url)
-        content_results = await self.content_analyzer.analyze(url)
-        
-        # Map analyzer results to scoring inputs
-        security_data = self._map_security_data(security_results)
-        review_data = self._map_review_data(social_results)
-        business_data = self._map_business_data(security_results, social_results)
-        content_data = self._map_content_data(content_results)
-        transparency_data = self._map_transparency_data(security_results)
-        
+        (self.security_analyzer, self.social_analyzer,
+         self.content_analyzer, self.scorer) = self._get_shared_analyzers()
+        self._analyze_cache = {}
+        # In-flight analyses keyed like the cache, so overlapping calls
+        # for the same URL piggyback on one set of network fetches
+        self._inflight = {}
+        # host -> [consecutive failures, last failure timestamp]
+        self._host_failures = {}
+
+    async def close(self):
+        """Close the shared sub-analyzers' sessions
+
+        The analyzers are process-wide singletons, so this releases the
+        pooled connections for every TrustAnalyzer instance; their lazy
+        _get_session() re-opens a session if one is needed again later.
+        """
+        await self.security_analyzer.close()
+        await self.social_analyzer.close()
+        await self.content_analyzer.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        """Normalize a URL so equivalent spellings share a cache slot"""
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+    @staticmethod
+    def _analysis_succeeded(results: Dict) -> bool:
+        """True when no analyzer slot degraded to an empty or failed result"""
+        return all(
+            section and section.get('status') != 'failed'
+            for section in results['raw_results'].values()
+        )
+
+    async def analyze(self, url: str, *, include_raw: bool = True) -> Dict:
+        """Perform comprehensive trust analysis of a website
+
+        Results are memoized per normalized URL with a TTL, and
+        concurrent calls for the same URL share one in-flight analysis
+        instead of racing to repeat it. Callers that only need the
+        score can pass include_raw=False to drop the raw_results
+        payload; the raw dicts are always shared by reference, never
+        copied.
+        """
+        cache_key = self._cache_key(url)
+        cached = self._analyze_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self._ANALYZE_CACHE_TTL:
+            results = cached[1]
+        else:
+            task = self._inflight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(self._analyze_uncached(url))
+                self._inflight[cache_key] = task
+                try:
+                    results = await task
+                finally:
+                    self._inflight.pop(cache_key, None)
+                # Only cache clean analyses; a timed-out or broken
+                # analyzer slot would otherwise pin its degraded score
+                # for the full TTL
+                if self._analysis_succeeded(results):
+                    self._analyze_cache[cache_key] = (time.monotonic(), results)
+            else:
+                # A second caller piggybacks on the first one's task;
+                # shield so cancelling this caller does not kill the
+                # shared analysis
+                results = await asyncio.shield(task)
+
+        if include_raw:
+            return results
+        return {'url': results['url'], 'trust_score': results['trust_score']}
+
+    async def analyze_many(self, urls, concurrency: int = 16,
+                           *, include_raw: bool = True) -> list:
+        """Analyze a list of URLs concurrently under a bounded semaphore
+
+        Results come back in input order. The cap keeps network overlap
+        high without exhausting connections; the sub-analyzers' shared
+        sessions pool TCP/TLS connections across the whole batch, and
+        duplicate URLs in the list coalesce through the analyze() cache.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(url):
+            async with sem:
+                return await self.analyze(url, include_raw=include_raw)
+
+        return await asyncio.gather(*(one(url) for url in urls))
+
+    async def analyze_stream(self, url: str):
+        """Yield per-analyzer results as they finish, then the aggregate
+
+        Emits {'security': ...}, {'social': ...} and {'content': ...}
+        in completion order so progressive consumers can render each
+        section as soon as it lands, followed by the same aggregate
+        dict analyze() returns. A failed analyzer degrades to an empty
+        dict so the mappers fall through to their defaults.
+        """
+        if not url.startswith(('http://', 'https://')):
+            host = urlparse('https://' + url).netloc.lower()
+        else:
+            host = urlparse(url).netloc.lower()
+
+        async def run(name, coro):
+            failures = self._host_failures.get(host)
+            if failures is not None and failures[0] >= self._BREAKER_THRESHOLD:
+                if time.monotonic() - failures[1] < self._BREAKER_RESET:
+                    # Breaker open: skip the call entirely
+                    coro.close()
+                    return name, {}
+                # Window elapsed; half-open, let this call probe the host
+                del self._host_failures[host]
+            try:
+                result = await asyncio.wait_for(coro, timeout=self._ANALYZER_TIMEOUT)
+            except Exception:
+                failures = self._host_failures.setdefault(host, [0, 0.0])
+                failures[0] += 1
+                failures[1] = time.monotonic()
+                return name, {}
+            self._host_failures.pop(host, None)
+            return name, result
+
+        # No TaskGroup here: yielding inside `async with TaskGroup` makes
+        # a consumer that abandons the stream mid-way see the GeneratorExit
+        # wrapped in a BaseExceptionGroup out of aclose(). Plain tasks with
+        # a finally block cancel and await the stragglers without
+        # re-wrapping the generator shutdown.
+        tasks = [
+            asyncio.create_task(run('security', self.security_analyzer.analyze(url))),
+            asyncio.create_task(run('social', self.social_analyzer.analyze(url))),
+            asyncio.create_task(run('content', self.content_analyzer.analyze(url))),
+        ]
+        results = {}
+        try:
+            for future in asyncio.as_completed(tasks):
+                name, result = await future
+                results[name] = result
+                yield {name: result}
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        yield self._aggregate(url, results['security'], results['social'],
+                              results['content'])
+
+    async def _analyze_uncached(self, url: str) -> Dict:
+        """Run the full analysis pipeline without consulting the cache"""
+        # Drain the streaming variant; its last item is the aggregate
+        results = None
+        async for results in self.analyze_stream(url):
+            pass
+        return results
+
+    def _aggregate(self, url: str, security_results: Dict, social_results: Dict,
+                   content_results: Dict) -> Dict:
+        """Score the three analyzer results into the final analysis dict"""
+        # Map analyzer results to scoring inputs in one fused pass
+        (security_data, review_data, business_data,
+         content_data, transparency_data) = self._map_scoring_inputs(
+            security_results, social_results, content_results
+        )
+
+
         # Calculate trust score
         trust_score = self.scorer.calculate_total_score(
             security_data,
@@ -35,9 +230,9 @@ class TrustAnalyzer:
         )
         
         # Add detailed review diversity information to the results
-        if 'review_diversity' in social_results:
-            trust_score['review_diversity_details'] = social_results['review_diversity']
-        
+        trust_score.review_diversity_details = social_results.get('review_diversity')
+
+
         return {
             'url': url,
             'trust_score': trust_score,
@@ -48,37 +243,49 @@ class TrustAnalyzer:
             }
         }
     
-    def _map_security_data(self, security_results: Dict) -> Dict:
-        """Map security analyzer results to scoring format"""
-        return {
-            'ssl_certificate': security_results.get('ssl_certificate', {}),
-            'security_headers': security_results.get('security_headers', {})
+    def _map_scoring_inputs(self, security_results: Dict, social_results: Dict,
+                            content_results: Dict) -> tuple:
+        """Map the three analyzer result dicts to the five scorer inputs
+
+        One fused pass over the results: each nested sub-dict is looked
+        up exactly once and bound to a local, instead of each former
+        _map_* helper re-fetching the sections it needed.
+        """
+        privacy = security_results.get('privacy_policy', _EMPTY)
+        contact_info = security_results.get('contact_info', _EMPTY)
+        testimonials = social_results.get('testimonials', _EMPTY)
+        review_presence = social_results.get('review_presence', _EMPTY)
+        review_diversity = social_results.get('review_diversity', _EMPTY)
+        team_presence = social_results.get('team_presence', _EMPTY)
+        documentation = content_results.get('documentation', _EMPTY)
+        blog_presence = content_results.get('blog_presence', _EMPTY)
+        thought_leadership = content_results.get('thought_leadership', _EMPTY)
+
+        security_data = {
+            'ssl_certificate': security_results.get('ssl_certificate', _EMPTY),
+            'security_headers': security_results.get('security_headers', _EMPTY)
         }
-    
-    def _map_review_data(self, social_results: Dict) -> Dict:
-        """Map social proof analyzer results to review scoring format with enhanced diversity metrics"""
-        testimonials = social_results.get('testimonials', {})
-        review_presence = social_results.get('review_presence', {})
-        review_diversity = social_results.get('review_diversity', {})
-        
+
         # Calculate review strength based on multiple factors
         has_reviews = testimonials.get('has_testimonials', False) or review_presence.get('has_reviews', False)
-        recent_reviews = bool(testimonials.get('testimonial_urls', []))
-        
-        # New diversity metrics
+        recent_reviews = bool(testimonials.get('testimonial_urls'))
+
+        # Diversity metrics
         diversity_score = review_diversity.get('diversity_score', 0)
         primary_sources = len(review_diversity.get('primary_sources', []))
         total_sources = review_diversity.get('total_sources', 0)
-        has_embedded_widgets = bool(review_diversity.get('embedded_widgets', []))
-        
-        # Determine review diversity based on enhanced metrics
+        has_embedded_widgets = bool(review_diversity.get('embedded_widgets'))
+
+        # Determine review diversity based on enhanced metrics; the
+        # predicates are side-effect free, so they are ordered cheapest
+        # first to let the short-circuit fire early
         diverse_reviews = (
+            diversity_score >= 7.0 or  # High diversity score
             total_sources >= 3 or  # Has multiple review sources
-            (primary_sources >= 2 and has_embedded_widgets) or  # Has major platforms and widgets
-            diversity_score >= 7.0  # High diversity score
+            (primary_sources >= 2 and has_embedded_widgets)  # Major platforms and widgets
         )
-        
-        return {
+
+        review_data = {
             'has_reviews': has_reviews,
             'recent_reviews': recent_reviews,
             'diverse_reviews': diverse_reviews,
@@ -89,31 +296,22 @@ class TrustAnalyzer:
                 'has_widgets': has_embedded_widgets
             }
         }
-    
-    def _map_business_data(self, security_results: Dict, social_results: Dict) -> Dict:
-        """Map analyzer results to business verification scoring format"""
-        contact_info = security_results.get('contact_info', {})
-        team_presence = social_results.get('team_presence', {})
-        
-        return {
+
+        business_data = {
             'has_credentials': team_presence.get('has_team_page', False),
             'contact_verified': contact_info.get('has_contact_page', False)
         }
-    
-    def _map_content_data(self, content_results: Dict) -> Dict:
-        """Map content analyzer results to scoring format"""
-        return {
-            'has_resources': content_results.get('documentation', {}).get('has_documentation', False),
-            'recent_content': content_results.get('blog_presence', {}).get('content_freshness') == 'Recent content found',
-            'expert_content': content_results.get('thought_leadership', {}).get('has_thought_leadership', False)
+
+        content_data = {
+            'has_resources': documentation.get('has_documentation', False),
+            'recent_content': blog_presence.get('content_freshness') in _FRESH_TOKENS,
+            'expert_content': thought_leadership.get('has_thought_leadership', False)
         }
-    
-    def _map_transparency_data(self, security_results: Dict) -> Dict:
-        """Map analyzer results to transparency scoring format"""
-        privacy = security_results.get('privacy_policy', {})
-        
-        return {
+
+        transparency_data = {
             'has_privacy_policy': privacy.get('has_privacy_policy', False),
-            'has_terms': True if privacy.get('policy_urls', []) else False,
+            'has_terms': bool(privacy.get('policy_urls')),
             'clear_pricing': False  # To be implemented with pricing detection
-        }
\ No newline at end of file
+        }
+
+        return security_data, review_data, business_data, content_data, transparency_data
\ No newline at end of file